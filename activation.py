@@ -0,0 +1,23 @@
+from settings import *
+
+
+class ActivationSystem:
+    # Enemies farther than radius from the viewport sleep: no AI, physics or animation until the camera comes near
+    def __init__(self, radius=ACTIVATION_RADIUS):
+        self.radius = radius
+        self.active, self.sleeping = [], []
+
+    def refresh(self, camera, group):
+        if self.radius is None:
+            self.active, self.sleeping = group.sprites(), []
+            return self.active
+        # Levels are one screen tall, so only the horizontal distance matters
+        zone = camera.view.inflate(self.radius * 2, 0)
+        left, right = zone.left, zone.right
+        self.active, self.sleeping = [], []
+        for enemy in group:
+            (self.active if enemy.rect.right >= left and enemy.rect.left <= right else self.sleeping).append(enemy)
+        return self.active
+
+    def counts(self):
+        return {'active': len(self.active), 'sleeping': len(self.sleeping)}
\ No newline at end of file
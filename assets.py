@@ -0,0 +1,158 @@
+import io
+import os
+import time
+import queue
+import threading
+import pygame
+
+
+class SilentSound:
+    def play(self, *args, **kwargs): pass
+
+    def set_volume(self, volume): pass
+
+    def get_num_channels(self): return 0
+
+
+def decode_image(path):
+    # File read and PNG decode only; converting to the display format must happen on the main thread
+    with open(path, 'rb') as f:
+        return pygame.image.load(io.BytesIO(f.read()), path)
+
+
+def decode_sound(path):
+    with open(path, 'rb') as f:
+        return pygame.mixer.Sound(io.BytesIO(f.read()))
+
+
+def decode_scaled_frames(paths, scale):
+    frames = []
+    for path in paths:
+        img = decode_image(path)
+        frames.append(pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale))))
+    return frames
+
+
+def convert_frames(frames):
+    return [frame.convert_alpha() for frame in frames]
+
+
+class AssetLoader:
+    # Jobs are split into work (runs on the worker thread) and finish (runs on the main thread in pump)
+    LOAD_ERRORS = (pygame.error, OSError, ValueError)
+
+    def __init__(self, threaded=True):
+        self.threaded = threaded
+        self.jobs = queue.Queue()
+        self.decoded = queue.Queue()
+        self.results = {}
+        self.total, self.done = 0, 0
+        self.worker = None
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return self.done == self.total
+
+    def submit(self, key, work, finish=None):
+        self.total += 1
+        if not self.threaded:
+            self._finish(key, finish, *self._run(work))
+            return
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+        self.jobs.put((key, work, finish))
+
+    def image(self, key, path):
+        self.submit(key, lambda: decode_image(path), lambda img: img.convert_alpha())
+
+    def get(self, key):
+        result = self.results[key]
+        if isinstance(result, Exception): raise result
+        return result
+
+    def pump(self, budget_ms=None):
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                self._finish(*self.decoded.get_nowait())
+            except queue.Empty:
+                break
+
+    def _run(self, work):
+        try:
+            return work(), None
+        except self.LOAD_ERRORS as e:
+            return None, e
+
+    def _work(self):
+        # Any other failure is handed to the main thread too: a dead worker would leave the loading screen waiting
+        while True:
+            key, work, finish = self.jobs.get()
+            try:
+                outcome = self._run(work)
+            except Exception as e:
+                outcome = None, e
+            self.decoded.put((key, finish) + outcome)
+
+    def _finish(self, key, finish, result, error):
+        if error is None and finish:
+            try:
+                result = finish(result)
+            except self.LOAD_ERRORS as e:
+                error = e
+        self.results[key] = error or result
+        self.done += 1
+
+
+class AnimationCache:
+    def __init__(self):
+        self.frames = {}
+        self.mirrors = {}
+        self.pending = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, char_type, animation, scale):
+        key = (char_type, animation, scale)
+        if key in self.frames:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._install(key, self._decode(char_type, animation, scale))
+        return self.frames[key]
+
+    def prefetch(self, loader, char_type, animation, scale):
+        key = (char_type, animation, scale)
+        if key in self.frames or key in self.pending: return
+        self.pending.add(key)
+        loader.submit(key, lambda: self._decode(char_type, animation, scale), lambda frames: self._install(key, frames))
+
+    def mirrored(self, image):
+        if image not in self.mirrors:
+            self.mirrors[image] = pygame.transform.flip(image, True, False)
+        return self.mirrors[image]
+
+    def _decode(self, char_type, animation, scale):
+        try:
+            num_of_frames = len(os.listdir(f'img/{char_type}/{animation}'))
+            return decode_scaled_frames([f'img/{char_type}/{animation}/{i}.png' for i in range(num_of_frames)], scale)
+        except FileNotFoundError:
+            print(f"Warning: Animation folder 'img/{char_type}/{animation}' not found.")
+            return []
+
+    def _install(self, key, frames):
+        self.pending.discard(key)
+        if key not in self.frames:
+            self.frames[key] = convert_frames(frames)
+            for frame in self.frames[key]: self.mirrored(frame)
+
+
+# Shared by every Soldier and Boss: frames are decoded once per (char_type, animation, scale)
+animations = AnimationCache()
+# Effect animations by name, filled once by Game.load_assets
+effects = {}
\ No newline at end of file
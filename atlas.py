@@ -0,0 +1,29 @@
+import pygame
+
+ATLAS_WIDTH = 512
+
+
+class Atlas:
+    def __init__(self, surface, regions):
+        self.surface = surface
+        self.regions = regions
+        self.views = {key: surface.subsurface(rect) for key, rect in regions.items()}
+
+    @classmethod
+    def pack(cls, images, width=ATLAS_WIDTH, padding=1):
+        # Shelf packing: tallest first, left to right, a new shelf whenever a row is full
+        regions, x, y, shelf = {}, 0, 0, 0
+        for key in sorted(images, key=lambda key: images[key].get_height(), reverse=True):
+            w, h = images[key].get_size()
+            if x + w > width: x, y, shelf = 0, y + shelf + padding, 0
+            regions[key] = pygame.Rect(x, y, w, h)
+            x, shelf = x + w + padding, max(shelf, h)
+        surface = pygame.Surface((width, y + shelf), pygame.SRCALPHA).convert_alpha()
+        for key, rect in regions.items():
+            # RGBA_MAX onto the transparent sheet copies pixels as-is instead of blending them
+            surface.blit(images[key], rect, special_flags=pygame.BLEND_RGBA_MAX)
+        return cls(surface, regions)
+
+    def image(self, key):
+        # A subsurface shares the atlas pixels, for sprites that need an image of their own
+        return self.views[key]
\ No newline at end of file
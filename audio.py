@@ -0,0 +1,86 @@
+import os
+import pygame
+from settings import *
+from assets import SilentSound, decode_sound
+
+
+class AudioManager:
+    # Sounds are cached by path, so effects sharing a file share one decoded Sound; effects are played by name
+    def __init__(self, game, enabled=True, cache_dir=AUDIO_CACHE_DIR):
+        self.game = game
+        self.enabled = enabled
+        self.cache_dir = cache_dir
+        self.sounds = {}
+        self.effects = {}
+        self.channels = {}  # effect name: the mixer channels reserved for it
+        self.voices = {}  # effect name: its playing channels, oldest first
+        self.played, self.stolen, self.culled = 0, 0, 0
+
+    def add(self, name, path, volume=1.0, voices=1):
+        self.effects[name] = (path, volume, voices)
+        self.voices[name] = []
+
+    def submit(self, loader):
+        for path in {path for path, _, _ in self.effects.values()}:
+            loader.submit(('sound', path), lambda path=path: self.decode(path))
+
+    def collect(self, loader):
+        for path in {path for path, _, _ in self.effects.values()}: self.sounds[path] = loader.get(('sound', path))
+        # Each effect gets channels of its own, one per voice plus one for a voice fading out after being stolen;
+        # reserving them keeps Sound.play() elsewhere off them, and effects sharing a Sound can't take each other's
+        if self.enabled and pygame.mixer.get_init():
+            reserved = sum(voices + 1 for _, _, voices in self.effects.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+            pygame.mixer.set_reserved(reserved)
+            first = 0
+            for name, (_, _, voices) in self.effects.items():
+                self.channels[name] = [pygame.mixer.Channel(i) for i in range(first, first + voices + 1)]
+                first += voices + 1
+
+    def decode(self, path):
+        # Runs on the loader thread. MP3 decoding is the slow part, so the decoded samples are kept on disk
+        if not self.enabled: return SilentSound()
+        raw_path = self._raw_path(path)
+        if raw_path and os.path.exists(raw_path) and os.path.getmtime(raw_path) >= os.path.getmtime(path):
+            with open(raw_path, 'rb') as f: return pygame.mixer.Sound(buffer=f.read())
+        sound = decode_sound(path)
+        if raw_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(raw_path + '.tmp', 'wb') as f: f.write(sound.get_raw())
+                os.replace(raw_path + '.tmp', raw_path)
+            except OSError:
+                pass  # The cache is only a speed-up; a read-only install just decodes every launch
+        return sound
+
+    def _raw_path(self, path):
+        # Raw samples are only valid for the mixer format they were decoded for, so it is part of the name
+        mixer = pygame.mixer.get_init()
+        if not self.cache_dir or not mixer: return None
+        frequency, size, channels = mixer
+        return os.path.join(self.cache_dir, f'{os.path.basename(path)}.{frequency}_{size}_{channels}.raw')
+
+    def play(self, name, source=None):
+        # source is the world rect of whatever made the sound; too far off screen and it is not played at all
+        path, volume, voices = self.effects[name]
+        if source is not None and not self.game.camera.view.inflate(AUDIO_CULL_MARGIN * 2, 0).colliderect(source):
+            self.culled += 1
+            return
+        self.played += 1
+        channels = self.channels.get(name)
+        if not channels: return  # no audio device
+        # At the effect's voice limit the oldest voice is cut short, so the newest shot is always heard
+        playing = [channel for channel in self.voices[name] if channel.get_busy()]
+        if len(playing) >= voices:
+            playing.pop(0).fadeout(AUDIO_STEAL_FADE_MS)
+            self.stolen += 1
+        # Normally the spare channel is free; if several steals are still fading, one of them is cut off instead
+        channel = next((channel for channel in channels if not channel.get_busy()), None) or \
+            next(channel for channel in channels if channel not in playing)
+        channel.play(self.sounds[path])
+        channel.set_volume(volume)
+        playing.append(channel)
+        self.voices[name] = playing
+
+    def stats(self):
+        return {'played': self.played, 'stolen': self.stolen, 'culled': self.culled}
\ No newline at end of file
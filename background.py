@@ -0,0 +1,20 @@
+import pygame
+from settings import *
+
+
+class ParallaxBackground:
+    def __init__(self, colour, layers):
+        # layers: (image, y, scroll factor), back to front; the first one is opaque and merged with the fill colour
+        base_img, base_y, base_factor = layers[0]
+        base = pygame.Surface((base_img.get_width(), SCREEN_HEIGHT))
+        base.fill(colour)
+        base.blit(base_img, (0, base_y))
+        self.layers = [(base.convert(), 0, base_factor)] + [(img, y, factor) for img, y, factor in layers[1:]]
+
+    def draw(self, surface, scroll):
+        for img, y, factor in self.layers:
+            width = img.get_width()
+            x = -(int(scroll * factor) % width)
+            surface.blit(img, (x, y))
+            # The layer wraps around, so one more copy covers whatever is left of the screen
+            if x + width < SCREEN_WIDTH: surface.blit(img, (x + width, y))
\ No newline at end of file
@@ -0,0 +1,146 @@
+import argparse
+import json
+import sys
+import time
+import pygame
+from settings import *
+from main import Game
+from sprites import Soldier, Grenade
+
+
+def spawn(game, enemies, bullets, grenades):
+    # Only the streamed-in columns have tiles, so soldiers placed anywhere else would just fall out of the level
+    rng, (first, last) = game.rng, game.world.loaded_columns()
+    for _ in range(enemies):
+        game.enemy_group.add(Soldier(game, 'enemy', rng.randrange(first * TILE_SIZE, last * TILE_SIZE),
+                                     rng.randrange(SCREEN_HEIGHT // 2), ENEMY_SCALE, ENEMY_SPEED, ENEMY_AMMO, ENEMY_GRENADES))
+    for _ in range(bullets):
+        owner = rng.choice([game.player] + game.enemy_group.sprites())
+        game.fire_bullet(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), rng.choice((-1, 1)), ENEMY_DAMAGE, owner)
+    for _ in range(grenades):
+        game.grenade_group.add(Grenade(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT // 2),
+                                       rng.choice((-1, 1)), game))
+
+
+def measure(ticks, step, prepare=None):
+    # prepare(tick) runs before each step without being timed, for setup that another case already measures
+    elapsed = 0.0
+    for tick in range(ticks):
+        if prepare: prepare(tick)
+        start = time.perf_counter()
+        step(tick)
+        elapsed += time.perf_counter() - start
+    return ticks / elapsed if elapsed else float('inf')
+
+
+def reload_level(game, level):
+    # Hand everything still in flight back to the pools first, so the reported pool counters stay truthful
+    for pool in (game.explosion_pool, game.bullet_pool, game.grenade_pool): pool.reclaim()
+    if game.projectiles: game.projectiles.clear()
+    game._load_level(level)
+
+
+def bench_level(game, level, args):
+    game.level = level
+    reload_level(game, level)
+    game.start_game, game.start_intro = True, False
+    spawn(game, args.enemies, args.bullets, args.grenades)
+    # Snapshot the populations so sprites killed mid-run keep being measured
+    enemies, bullets, grenades = game.enemy_group.sprites(), game.bullet_group.sprites(), game.grenade_group.sprites()
+    bullet_spawns = [(bullet, *bullet.rect.center, bullet.direction, bullet.damage, bullet.owner) for bullet in bullets]
+    grenade_spawns = [(grenade, *grenade.rect.center, grenade.direction) for grenade in grenades]
+    level_width = max(game.world.level_length * TILE_SIZE - SCREEN_WIDTH, 1)
+    projectiles = game.projectiles
+    if projectiles:
+        arrays = (projectiles.pos, projectiles.prev_x, projectiles.vel, projectiles.damage, projectiles.owner)
+        saved = projectiles.count, [array.copy() for array in arrays]
+
+    # Projectiles are put back at their spawn state before every (untimed) tick, so each case keeps timing flight
+    # rather than bullets that left the screen or grenades that already went off
+    def rearm_bullets(tick):
+        if not projectiles:
+            for bullet, *spawned in bullet_spawns: bullet.reset(*spawned)
+            return
+        projectiles.count = saved[0]
+        for array, copy in zip(arrays, saved[1]): array[:] = copy
+
+    def bullet_update(tick):
+        if projectiles: return projectiles.update()
+        for bullet in bullets: bullet.update()
+
+    def rearm_grenades(tick):
+        for grenade, *spawned in grenade_spawns: grenade.reset(*spawned)
+
+    def world_stream(tick):
+        game.camera.reset((tick * PLAYER_SPEED) % level_width)
+        game.world.stream(game.camera)
+
+    def full_frame(tick):
+        game.apply_inputs(('right', 'shoot') if tick % 2 else ('right',))
+        game.update()
+        game.draw()
+
+    results = {
+        'soldier_move': measure(args.ticks, lambda tick: [enemy.move(tick % 60 < 30, tick % 60 >= 30) for enemy in enemies]),
+        'bullet_update': measure(args.ticks, bullet_update, rearm_bullets),
+        'grenade_update': measure(args.ticks, lambda tick: [grenade.update() for grenade in grenades], rearm_grenades),
+        'world_stream': measure(args.ticks, world_stream),
+        'world_draw': measure(args.ticks, lambda tick: game.world.draw(game.screen, game.camera), world_stream),
+    }
+    reload_level(game, level)
+    spawn(game, args.enemies, args.bullets, args.grenades)
+    results['headless_frame'] = measure(args.ticks, full_frame)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for level, cases in baseline.get('results', {}).items():
+        for case, expected in cases.items():
+            actual = results.get(level, {}).get(case)
+            if actual is not None and actual < expected * (1 - tolerance):
+                regressions.append(f'{level}.{case}: {actual:.0f} tps vs baseline {expected:.0f} tps')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ticks-per-second benchmarks for the simulation and rendering hot paths')
+    parser.add_argument('--levels', type=int, nargs='+', default=list(range(1, MAX_LEVELS + 1)))
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--enemies', type=int, default=10, help='extra enemies spawned on top of the level data')
+    parser.add_argument('--bullets', type=int, default=50)
+    parser.add_argument('--grenades', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--array-projectiles', action='store_true', help='benchmark the numpy projectile engine')
+    parser.add_argument('--output', metavar='PATH', help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', metavar='PATH', help='compare against a saved report and fail on regressions')
+    parser.add_argument('--save-baseline', metavar='PATH', help='also save this report as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown before a case counts as a regression')
+    args = parser.parse_args()
+
+    game = Game(headless=True, seed=args.seed, array_projectiles=args.array_projectiles)
+    if not game.running: sys.exit(1)
+    report = {
+        'config': {key: getattr(args, key) for key in ('ticks', 'enemies', 'bullets', 'grenades', 'seed', 'array_projectiles')},
+        'pygame': pygame.version.ver,
+        'results': {f'level{level}': bench_level(game, level, args) for level in args.levels},
+    }
+    # Pool counters across the whole run, for sizing BULLET_POOL_SIZE and friends
+    report['pools'] = game.pool_stats()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f: f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f: f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f: regressions = compare(report['results'], json.load(f), args.tolerance)
+        for line in regressions: print(f'REGRESSION {line}', file=sys.stderr)
+        if regressions: sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pygame
+from settings import *
+
+
+class Camera:
+    def __init__(self):
+        self.reset()
+
+    def reset(self, scroll=0):
+        # offset is the scroll used for drawing; it lags scroll by the interpolation fraction
+        self.scroll = self.prev_scroll = self.offset = scroll
+        self.alpha = 1.0
+
+    def tick(self):
+        self.prev_scroll = self.scroll
+
+    def interpolate(self, alpha):
+        self.alpha = alpha
+        self.offset = round(self.prev_scroll + (self.scroll - self.prev_scroll) * alpha)
+
+    @property
+    def view(self):
+        return pygame.Rect(self.scroll, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def apply(self, rect):
+        return rect.move(-self.scroll, 0)
+
+    def project(self, sprite):
+        # Screen rect of a sprite drawn between its previous and current tick positions
+        rect, prev = sprite.rect, getattr(sprite, 'prev_pos', None)
+        if prev is None or self.alpha >= 1: return rect.move(-self.offset, 0)
+        back = 1 - self.alpha
+        return rect.move(round((prev[0] - rect.x) * back) - self.offset, round((prev[1] - rect.y) * back))
+
+    def visible_columns(self, margin=CULL_MARGIN):
+        first = max((self.offset - margin) // TILE_SIZE, 0)
+        return first, (self.offset + SCREEN_WIDTH + margin) // TILE_SIZE + 1
+
+    def follow(self, rect, dx, level_width):
+        left, right = rect.left - self.scroll, rect.right - self.scroll
+        if (right > SCREEN_WIDTH - SCROLL_THRESH and self.scroll < level_width - SCREEN_WIDTH) or \
+                (left < SCROLL_THRESH and self.scroll > abs(dx)):
+            self.scroll += dx
+
+    def draw_group(self, surface, group, margin=CULL_MARGIN):
+        view = self.view.inflate(margin * 2, margin * 2)
+        return [surface.blit(sprite.image, self.project(sprite)) for sprite in group if view.colliderect(sprite.rect)]
\ No newline at end of file
@@ -0,0 +1,38 @@
+from settings import *
+
+
+class SpatialHash:
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+
+    def insert(self, sprite):
+        self.order[sprite] = len(self.order)
+        for key in self._cells(sprite.rect): self.cells.setdefault(key, []).append(sprite)
+
+    def query(self, rect):
+        found = set()
+        for key in self._cells(rect): found.update(self.cells.get(key, ()))
+        # Candidates come back in insertion order, so callers see the same order as the source group
+        return sorted(found, key=self.order.__getitem__)
+
+    def _cells(self, rect):
+        size = self.cell_size
+        return [(x, y) for x in range(rect.left // size, (rect.right - 1) // size + 1)
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+
+class CollisionService:
+    # Broad phase only: callers still do the exact rect test on the candidates they get back
+    def __init__(self):
+        self.layers = {}
+
+    def rebuild(self, name, sprites):
+        layer = self.layers[name] = SpatialHash()
+        for sprite in sprites: layer.insert(sprite)
+
+    def nearby(self, name, rect, slack=0):
+        # slack widens the query for sprites that may have moved since the layer was rebuilt
+        if name not in self.layers: return []
+        return self.layers[name].query(rect.inflate(slack * 2, slack * 2))
\ No newline at end of file
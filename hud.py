@@ -0,0 +1,46 @@
+import pygame
+from settings import *
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = {}
+
+    def render(self, text, font, colour):
+        key = (text, font, colour)
+        if key not in self.surfaces:
+            # Strings like the damage multiplier keep changing, so drop everything rather than grow forever
+            if len(self.surfaces) >= self.max_entries: self.surfaces.clear()
+            self.surfaces[key] = font.render(text, True, colour)
+        return self.surfaces[key]
+
+
+class Hud:
+    # Rendered offscreen and rebuilt only when one of the displayed player values changes
+    def __init__(self, game):
+        self.game = game
+        self.surface = pygame.Surface((SCREEN_WIDTH, HUD_HEIGHT), pygame.SRCALPHA)
+        self.state = None
+        self.bounds = self.surface.get_rect()
+
+    def draw(self, surface):
+        player = self.game.player
+        state = (player.health, player.max_health, player.ammo, player.grenades, player.damage_multiplier)
+        if state != self.state:
+            self.state = state
+            self._render(player)
+        return surface.blit(self.surface, self.bounds, self.bounds)
+
+    def _render(self, player):
+        game, hud = self.game, self.surface
+        hud.fill((0, 0, 0, 0))
+        game.health_bar.draw(hud, player.health)
+        hud.blit(game.text_cache.render('ПУЛИ: ', game.font, BLACK), (10, 35))
+        hud.blits([(game.atlas.surface, (90 + (x * 10), 40), game.atlas.regions['bullet'])
+                   for x in range(player.ammo)], doreturn=False)
+        hud.blit(game.text_cache.render('ГРАНАТЫ: ', game.font, BLACK), (10, 60))
+        hud.blits([(game.atlas.surface, (135 + (x * 15), 60), game.atlas.regions['grenade'])
+                   for x in range(player.grenades)], doreturn=False)
+        hud.blit(game.text_cache.render(f'УРОН: x{player.damage_multiplier:.1f}', game.font, BLACK), (10, 85))
+        self.bounds = hud.get_bounding_rect()
\ No newline at end of file
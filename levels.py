@@ -0,0 +1,67 @@
+import os
+import csv
+import sys
+import mmap
+import struct
+from settings import *
+
+# Binary level: header, then one int8 per tile stored column by column
+MAGIC = b'LVL2'
+HEADER = struct.Struct('<4sHI')
+
+
+class LevelData:
+    def __init__(self, rows, cols, tiles):
+        self.rows, self.cols = rows, cols
+        self.tiles = memoryview(tiles).cast('b')
+
+    def column(self, x):
+        return self.tiles[x * self.rows:(x + 1) * self.rows]
+
+
+def level_paths(level):
+    return f'level{level}_data.bin', f'level{level}_data.csv'
+
+
+def read_csv(path):
+    with open(path, newline='') as csvfile:
+        grid = [[int(tile) for tile in row] for row in csv.reader(csvfile, delimiter=',')]
+    rows, cols = max(len(grid), ROWS), max([len(row) for row in grid] + [0])
+    tiles = bytearray(b'\xff' * (rows * cols))
+    for y, row in enumerate(grid):
+        for x, tile in enumerate(row): tiles[x * rows + y] = tile & 0xff
+    return LevelData(rows, cols, tiles)
+
+
+def read_binary(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size: raise ValueError(f'{path} is truncated')
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, rows, cols = HEADER.unpack_from(data)
+    if magic != MAGIC: raise ValueError(f'{path} is not a level file')
+    if len(data) < HEADER.size + rows * cols: raise ValueError(f'{path} is truncated')
+    return LevelData(rows, cols, memoryview(data)[HEADER.size:HEADER.size + rows * cols])
+
+
+def write_binary(path, level_data):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, level_data.rows, level_data.cols))
+        f.write(level_data.tiles.tobytes())
+
+
+def load_level(level):
+    bin_path, csv_path = level_paths(level)
+    # A CSV edited after the last conversion wins over the stale binary
+    if os.path.exists(bin_path) and not (os.path.exists(csv_path) and
+                                         os.path.getmtime(csv_path) > os.path.getmtime(bin_path)):
+        return read_binary(bin_path)
+    return read_csv(csv_path)
+
+
+if __name__ == '__main__':
+    # Usage: python levels.py [levelN_data.csv ...]  (defaults to every level)
+    paths = sys.argv[1:] or [level_paths(level)[1] for level in range(1, MAX_LEVELS + 1)]
+    for csv_path in paths:
+        bin_path = os.path.splitext(csv_path)[0] + '.bin'
+        write_binary(bin_path, read_csv(csv_path))
+        print(f'{csv_path} -> {bin_path} ({os.path.getsize(bin_path)} bytes)')
\ No newline at end of file
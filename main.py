@@ -1,70 +1,147 @@
+import os
+import argparse
+import random
+import time
 import pygame
-import csv
 import sys
 from settings import *
 from button import Button
-from world import World
-from sprites import Grenade, ScreenFade
+from atlas import Atlas
+from background import ParallaxBackground
+from assets import AssetLoader, animations, effects, convert_frames, decode_image, decode_scaled_frames
+from audio import AudioManager
+from camera import Camera
+from collision import CollisionService
+from hud import Hud, TextCache
+from levels import load_level
+from pool import SpritePool
+from profiler import Profiler
+from render import DirtyRectRenderer
+from activation import ActivationSystem
+from projectiles import ProjectileArray, HAVE_NUMPY as PROJECTILES_AVAILABLE
+from particles import ParticleSystem, HAVE_NUMPY as PARTICLES_AVAILABLE
+from world import World, LevelSnapshot, CHARACTER_TILES
+from sprites import Soldier, Bullet, Grenade, Explosion, ScreenFade
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+    def __init__(self, headless=False, seed=None, profiler=None, dirty_rects=False, array_projectiles=ARRAY_PROJECTILES,
+                 particles=PARTICLES):
+        self.headless = headless
+        self.profiler = profiler or Profiler()
+        if headless:
+            # No window and no audio device: simulation only, e.g. for benchmarks and CI playthroughs
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
+            pygame.font.init()
+        else:
+            pygame.init()
+            pygame.mixer.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption('Путь героя')
         self.clock = pygame.time.Clock()
+        self.rng = random.Random(seed)
+        self.ticks = 0
         self.running = True
         self.start_game = False
         self.start_intro = False
         self.level = 1
+        self.text_cache = TextCache()
+        self.level_snapshot, self.checkpoint = None, None
+        self.prefetched = {}
+        # Headless runs decode inline: there is no loading screen to keep responsive
+        self.loader = AssetLoader(threaded=not headless)
+        self.audio = AudioManager(self, enabled=not headless)
 
         self.load_assets()
-
-        self.screen_scroll, self.bg_scroll = 0, 0
+        if self.running: self._create_ui()
+        self.renderer = DirtyRectRenderer(self) if dirty_rects else None
+        self.projectiles = None
+        if array_projectiles and self.running:
+            if PROJECTILES_AVAILABLE:
+                self.projectiles = ProjectileArray(self)
+            else:
+                print("Warning: numpy is not installed, bullets fall back to sprites.")
+        # Particles are purely visual, so headless runs and installs without numpy simply go without them
+        self.particles = None
+        if particles and PARTICLES_AVAILABLE and self.running and not headless:
+            self.particles = ParticleSystem(self, seed=seed)
+
+        self.camera = Camera()
+        self.collision = CollisionService()
+        self.activation = ActivationSystem()
+        self.explosion_pool = SpritePool(lambda x, y: Explosion(x, y, self), EXPLOSION_POOL_SIZE)
+        self.bullet_pool = SpritePool(lambda x, y, direction, damage, owner: Bullet(x, y, direction, damage, owner, self),
+                                      BULLET_POOL_SIZE)
+        self.grenade_pool = SpritePool(lambda x, y, direction: Grenade(x, y, direction, self), GRENADE_POOL_SIZE)
         self.moving_left, self.moving_right, self.shoot, self.grenade, self.grenade_thrown = False, False, False, False, False
 
+    @property
+    def time_ms(self):
+        # Simulation clock: advances one tick per update, independent of wall time
+        return self.ticks * 1000 // TICK_RATE
+
     def load_assets(self):
+        loader = self.loader
+
+        # Sounds: effects that share a file share one decoded Sound, but each effect has its own voices; past the
+        # limit a new sound replaces the effect's oldest one, so gunfire never silences explosions or pickups
+        for name, path, voices in (('jump', 'audio/jump.mp3', 1), ('shot', 'audio/shot.mp3', 3),
+                                   ('grenade', 'audio/shot.mp3', 5), ('powerup', 'audio/jump.mp3', 2)):
+            self.audio.add(name, path, volume=0.05, voices=voices)
+        self.audio.submit(loader)
+
+        # Images
+        for key, path in (('start_img', 'img/start_btn.png'), ('exit_img', 'img/exit_btn.png'),
+                          ('restart_img', 'img/restart_btn.png'), ('pine1_img', 'img/background/pine1.png'),
+                          ('pine2_img', 'img/background/pine2.png'), ('mountain_img', 'img/background/mountain.png'),
+                          ('sky_img', 'img/background/sky_cloud.png'), ('bullet_img', 'img/icons/bullet.png'),
+                          ('grenade_img_icon', 'img/icons/grenade.png')):
+            loader.image(key, path)
+        for item_type, name in (('Health', 'health'), ('Ammo', 'ammo'), ('Grenade', 'grenade'), ('Damage', 'damage')):
+            loader.image(('item_box', item_type), f'img/icons/{name}_box.png')
+
+        # Effects
+        loader.submit('explosion', lambda: decode_scaled_frames(
+            [f'img/explosion/exp{num}.png' for num in range(1, 6)], 0.5), convert_frames)
+
+        # Tiles
+        for x in range(TILE_TYPES):
+            loader.submit(('tile', x), lambda x=x: pygame.transform.scale(decode_image(f'img/tile/{x}.png'),
+                                                                          (TILE_SIZE, TILE_SIZE)),
+                          lambda img: img.convert_alpha())
+        self._prefetch_level(self.level)
+
+        self._show_loading_screen()
+        if not self.running: return
+
         try:
-            def load_image(path):
-                return pygame.image.load(path).convert_alpha()
-
-            # Sounds
-            self.jump_fx = pygame.mixer.Sound('../SHOOTER_MIEM_2D/audio/jump.mp3')
-            self.jump_fx.set_volume(0.05)
-            self.shot_fx = pygame.mixer.Sound('../SHOOTER_MIEM_2D/audio/shot.mp3')
-            self.shot_fx.set_volume(0.05)
-            self.grenade_fx = pygame.mixer.Sound('../SHOOTER_MIEM_2D/audio/shot.mp3')
-            self.grenade_fx.set_volume(0.05)
-            self.powerup_fx = pygame.mixer.Sound('../SHOOTER_MIEM_2D/audio/jump.mp3')
-            self.powerup_fx.set_volume(0.05)
-
-            # Images
-            self.start_img = load_image('img/start_btn.png')
-            self.exit_img = load_image('img/exit_btn.png')
-            self.restart_img = load_image('img/restart_btn.png')
-
-            self.pine1_img, self.pine2_img = load_image('img/Background/pine1.png'), load_image(
-                'img/Background/pine2.png')
-            self.mountain_img, self.sky_img = load_image('img/Background/mountain.png'), load_image(
-                'img/Background/sky_cloud.png')
-
-            self.bullet_img = load_image('img/icons/bullet.png')
-            self.grenade_img_icon = load_image('img/icons/grenade.png')
-            self.item_boxes_images = {
-                'Health': load_image('img/icons/health_box.png'), 'Ammo': load_image('img/icons/ammo_box.png'),
-                'Grenade': load_image('img/icons/grenade_box.png'), 'Damage': load_image('img/icons/damage_box.png')}
-
-            # Tiles
-            self.img_list = []
+            self.audio.collect(loader)
+            for key in ('start_img', 'exit_img', 'restart_img', 'pine1_img', 'pine2_img', 'mountain_img', 'sky_img'):
+                setattr(self, key, loader.get(key))
+            effects['explosion'] = loader.get('explosion')
+            self.background = ParallaxBackground(BG, [
+                (self.sky_img, 0, 0.5),
+                (self.mountain_img, SCREEN_HEIGHT - self.mountain_img.get_height() - 300, 0.6),
+                (self.pine1_img, SCREEN_HEIGHT - self.pine1_img.get_height() - 150, 0.7),
+                (self.pine2_img, SCREEN_HEIGHT - self.pine2_img.get_height(), 0.8)])
+
+            # Tiles, item boxes and icons share one atlas surface
+            sprites = {'bullet': loader.get('bullet_img'), 'grenade': loader.get('grenade_img_icon')}
+            for item_type in ('Health', 'Ammo', 'Grenade', 'Damage'):
+                sprites[('item_box', item_type)] = loader.get(('item_box', item_type))
             for x in range(TILE_TYPES):
                 # This inner try-except handles missing tiles gracefully without crashing the whole game
                 try:
-                    img = load_image(f'img/Tile/{x}.png')
-                    self.img_list.append(pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE)))
-                except pygame.error:
-                    print(f"Warning: Tile image 'img/Tile/{x}.png' not found.")
-                    self.img_list.append(pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA))
+                    sprites[('tile', x)] = loader.get(('tile', x))
+                except (pygame.error, FileNotFoundError):
+                    print(f"Warning: Tile image 'img/tile/{x}.png' not found.")
+                    sprites[('tile', x)] = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            self.atlas = Atlas.pack(sprites)
+            self.img_list = [self.atlas.image(('tile', x)) for x in range(TILE_TYPES)]
+            self.item_boxes_images = {item_type: self.atlas.image(('item_box', item_type))
+                                      for item_type in ('Health', 'Ammo', 'Grenade', 'Damage')}
+            self.bullet_img, self.grenade_img_icon = self.atlas.image('bullet'), self.atlas.image('grenade')
 
             # Font
             try:
@@ -78,6 +155,44 @@ class Game:
             print(f"--- Pygame Error: {e} ---")
             self.running = False
 
+    def _show_loading_screen(self):
+        font = pygame.font.SysFont(FONT_NAME, 30)
+        bar = pygame.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, SCREEN_WIDTH // 2, 24)
+        while not self.loader.finished and self.running:
+            self.clock.tick(FPS)
+            self.loader.pump(LOADER_BUDGET_MS)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: self.running = False
+            self.screen.fill(WHITE)
+            self._draw_text('ЗАГРУЗКА...', font, BLACK, bar.x, bar.y - 40)
+            pygame.draw.rect(self.screen, BLACK, bar.inflate(4, 4))
+            pygame.draw.rect(self.screen, GREEN, (bar.x, bar.y, bar.width * self.loader.progress, bar.height))
+            pygame.display.update()
+
+    def _prefetch_level(self, level):
+        # Level file and soldier frames are read on the loader thread; the result is picked up by _load_level
+        if level > MAX_LEVELS or level in self.prefetched: return
+
+        def work():
+            level_data = load_level(level)
+            return level_data, {CHARACTER_TILES[tile] for tile in set(level_data.tiles.tobytes()) if tile in CHARACTER_TILES}
+
+        def finish(result):
+            level_data, characters = result
+            self.prefetched[level] = level_data
+            for char_type, scale in characters:
+                for animation in Soldier.ANIMATION_TYPES: animations.prefetch(self.loader, char_type, animation, scale)
+
+        self.loader.submit(('level', level), work, finish)
+
+    def _create_ui(self):
+        self.start_button = Button(SCREEN_WIDTH // 2 - 130, SCREEN_HEIGHT // 2 - 150, self.start_img, 1)
+        self.exit_button = Button(SCREEN_WIDTH // 2 - 110, SCREEN_HEIGHT // 2 + 50, self.exit_img, 1)
+        self.restart_button = Button(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50, self.restart_img, 2)
+        self.intro_fade = ScreenFade(BLACK, 4, self.screen, fade_in=True)
+        self.death_fade = ScreenFade(PINK, 4, self.screen)
+        self.hud = Hud(self)
+
     def _create_sprite_groups(self):
         self.enemy_group = pygame.sprite.Group()
         self.bullet_group = pygame.sprite.Group()
@@ -87,100 +202,206 @@ class Game:
         self.decoration_group = pygame.sprite.Group()
         self.water_group = pygame.sprite.Group()
         self.exit_group = pygame.sprite.Group()
+        # Decorations and water are baked into the world chunks, so they are updated but not drawn
+        self.drawn_groups = [self.enemy_group, self.bullet_group, self.grenade_group, self.explosion_group,
+                             self.item_box_group, self.exit_group]
+        self.all_groups = self.drawn_groups + [self.decoration_group, self.water_group]
+        # Enemies are updated separately, and only while the activation system has them awake
+        self.updated_groups = [group for group in self.all_groups if group is not self.enemy_group]
 
     def _load_level(self, level):
         self._create_sprite_groups()
-        world_data = [[-1] * COLS for _ in range(ROWS)]
         try:
-            with open(f'level{level}_data.csv', newline='') as csvfile:
-                reader = csv.reader(csvfile, delimiter=',')
-                for x, row in enumerate(reader):
-                    for y, tile in enumerate(row): world_data[x][y] = int(tile)
+            world_data = self.prefetched.pop(level, None) or load_level(level)
         except FileNotFoundError:
             print(f"Error: level{level}_data.csv not found.")
             self.running = False
             return
+        except ValueError as e:
+            print(f"Error: {e}")
+            self.running = False
+            return
         self.world = World(self)
         self.player, self.health_bar = self.world.process_data(world_data)
+        self.camera.reset()
+        self.world.stream(self.camera)
+        self.level_snapshot, self.checkpoint = LevelSnapshot(self), None
+        self._prefetch_level(level + 1)
 
     def _reset_level(self):
-        self.bg_scroll, self.screen_scroll, self.start_intro = 0, 0, True
+        self.start_intro = True
         self.intro_fade.reset()
         self.death_fade.reset()
-        self._load_level(self.level)
+        self.explosion_group.empty()
+        # Projectiles still in flight are dropped with the old level's groups
+        for pool in (self.explosion_pool, self.bullet_pool, self.grenade_pool): pool.reclaim()
+        if self.projectiles: self.projectiles.clear()
+        if self.particles: self.particles.clear()
+        # A restart can land on the same world and scroll, which the renderer's static key would not notice
+        if self.renderer: self.renderer.invalidate()
+        # Restart from the checkpoint or the cached level start; only an unseen level is parsed again
+        snapshot = self.checkpoint or self.level_snapshot
+        if snapshot:
+            snapshot.restore(self)
+        else:
+            self._load_level(self.level)
 
     def _draw_text(self, text, font, text_col, x, y):
-        self.screen.blit(font.render(text, True, text_col), (x, y))
+        self.screen.blit(self.text_cache.render(text, font, text_col), (x, y))
 
     def _draw_bg(self):
-        self.screen.fill(BG)
-        width = self.sky_img.get_width()
-        for x in range(5):
-            self.screen.blit(self.sky_img, ((x * width) - self.bg_scroll * 0.5, 0))
-            self.screen.blit(self.mountain_img,
-                             ((x * width) - self.bg_scroll * 0.6, SCREEN_HEIGHT - self.mountain_img.get_height() - 300))
-            self.screen.blit(self.pine1_img,
-                             ((x * width) - self.bg_scroll * 0.7, SCREEN_HEIGHT - self.pine1_img.get_height() - 150))
-            self.screen.blit(self.pine2_img,
-                             ((x * width) - self.bg_scroll * 0.8, SCREEN_HEIGHT - self.pine2_img.get_height()))
+        self.background.draw(self.screen, self.camera.offset)
 
     def _draw_hud(self):
-        self.health_bar.draw(self.screen, self.player.health)
-        self._draw_text('ПУЛИ: ', self.font, BLACK, 10, 35)
-        for x in range(self.player.ammo): self.screen.blit(self.bullet_img, (90 + (x * 10), 40))
-        self._draw_text('ГРАНАТЫ: ', self.font, BLACK, 10, 60)
-        for x in range(self.player.grenades): self.screen.blit(self.grenade_img_icon, (135 + (x * 15), 60))
-        self._draw_text(f'УРОН: x{self.player.damage_multiplier:.1f}', self.font, BLACK, 10, 85)
+        return self.hud.draw(self.screen)
 
     def run(self):
         if not self.running: return  # Exit if assets failed to load
 
-        self.start_button = Button(SCREEN_WIDTH // 2 - 130, SCREEN_HEIGHT // 2 - 150, self.start_img, 1)
-        self.exit_button = Button(SCREEN_WIDTH // 2 - 110, SCREEN_HEIGHT // 2 + 50, self.exit_img, 1)
-        self.restart_button = Button(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50, self.restart_img, 2)
-        self.intro_fade = ScreenFade(BLACK, 4, self.screen, fade_in=True)
-        self.death_fade = ScreenFade(PINK, 4, self.screen)
-
         self._load_level(self.level)
+        tick_ms, lag = 1000 / TICK_RATE, 0.0
 
         while self.running:
-            self.clock.tick(FPS)
+            elapsed = self.clock.tick(FPS)
+            self.profiler.begin_frame()
+            self.loader.pump(LOADER_BUDGET_MS)
+            steps = 0
             if not self.start_game:
+                # The menu never changes after its first frame, so it reports no dirty rects
+                rects = []
                 self.screen.fill(WHITE)
                 if self.start_button.draw(self.screen): self.start_game, self.start_intro = True, True
                 if self.exit_button.draw(self.screen): self.running = False
             else:
-                self._draw_bg()
-                self.world.draw(self.screen, self.screen_scroll)
-                self._draw_hud()
-
-                all_groups = [self.enemy_group, self.bullet_group, self.grenade_group, self.explosion_group,
-                              self.item_box_group, self.decoration_group, self.water_group, self.exit_group]
-                self.player.update()
-                [group.update() for group in all_groups]
-                [enemy.ai() for enemy in self.enemy_group]
-                self.player.draw(self.screen)
-                [group.draw(self.screen) for group in all_groups]
-
-                if self.start_intro:
-                    if self.intro_fade.fade(): self.start_intro = False
-
-                if self.player.alive:
-                    self.update_player_actions()
-                else:
-                    self.screen_scroll = 0
-                    if self.death_fade.fade() and self.restart_button.draw(self.screen): self._reset_level()
+                # Fixed-timestep simulation: slow frames run several ticks, fast ones may run none
+                lag += elapsed
+                while lag >= tick_ms and steps < MAX_CATCH_UP_TICKS:
+                    self.update()
+                    lag -= tick_ms
+                    steps += 1
+                # Past the catch-up limit the backlog is dropped and the game slows down instead of stalling
+                if steps == MAX_CATCH_UP_TICKS: lag %= tick_ms
+                rects = self.draw(lag / tick_ms)
 
             self.handle_events()
-            pygame.display.update()
+            with self.profiler.phase('display'):
+                if self.renderer:
+                    self.renderer.present(rects)
+                else:
+                    pygame.display.update()
+            if self.start_game: self.profiler.end_frame(ticks=steps, **self.entity_counts())
+
+    def simulate(self, ticks, script=None):
+        # Steps the current level as fast as possible; script(tick) returns the held inputs for that tick
+        if not self.running: return None
+        self._load_level(self.level)
+        self.start_game = True
+        done, start = 0, time.perf_counter()
+        while done < ticks and self.running:
+            inputs = script(done) if script else ()
+            self.apply_inputs(inputs)
+            if 'restart' in inputs and not self.player.alive: self._reset_level()
+            self.profiler.begin_frame()
+            self.update()
+            self.profiler.end_frame(**self.entity_counts())
+            done += 1
+        elapsed = time.perf_counter() - start
+        return {'ticks': done, 'seconds': elapsed, 'tps': done / elapsed if elapsed else 0.0,
+                'level': self.level, 'player_alive': self.player.alive, 'enemies': len(self.enemy_group),
+                'pools': self.pool_stats(), 'audio': self.audio.stats()}
+
+    def apply_inputs(self, inputs):
+        self.moving_left, self.moving_right = 'left' in inputs, 'right' in inputs
+        self.shoot = 'shoot' in inputs
+        if 'grenade' not in inputs: self.grenade_thrown = False
+        self.grenade = 'grenade' in inputs
+        if 'jump' in inputs and self.player.alive: self.player.jump = True
+
+    def fire_bullet(self, x, y, direction, damage, owner):
+        if self.projectiles:
+            self.projectiles.spawn(x, y, direction, damage, owner)
+        else:
+            self.bullet_group.add(self.bullet_pool.acquire(x, y, direction, damage, owner))
+
+    def emit(self, name, x, y, count, direction=0):
+        if self.particles: self.particles.emit(name, x, y, count, direction)
+
+    def pool_stats(self):
+        stats = {'explosions': self.explosion_pool.stats(), 'bullets': self.bullet_pool.stats(),
+                 'grenades': self.grenade_pool.stats()}
+        if self.projectiles: stats['projectiles'] = self.projectiles.stats()
+        if self.particles: stats['particles'] = self.particles.stats()
+        return stats
+
+    def entity_counts(self):
+        bullets = len(self.bullet_group) + (self.projectiles.count if self.projectiles else 0)
+        return {'enemies': len(self.enemy_group), 'bullets': bullets,
+                'grenades': len(self.grenade_group), 'explosions': len(self.explosion_group),
+                'particles': self.particles.count if self.particles else 0, 'chunks': len(self.world.loaded),
+                **self.activation.counts()}
+
+    def update(self):
+        self.ticks += 1
+        self.camera.tick()
+        with self.profiler.phase('stream'):
+            self.world.stream(self.camera)
+        with self.profiler.phase('groups'):
+            active = self.activation.refresh(self.camera, self.enemy_group)
+            self.collision.rebuild('enemies', active)
+            self.player.update()
+            for enemy in active: enemy.update()
+            [group.update() for group in self.updated_groups]
+            if self.projectiles: self.projectiles.update()
+            if self.particles: self.particles.update()
+            # The items layer is only rebuilt when chunks stream in or out, so collected boxes are skipped by alive()
+            for item in self.collision.nearby('items', self.player.rect):
+                if item.alive() and pygame.sprite.collide_rect(item, self.player): item.collect(self.player)
+        with self.profiler.phase('ai'):
+            [enemy.ai() for enemy in active]
+        if self.player.alive: self.update_player_actions()
+
+    def draw(self, alpha=1.0):
+        # alpha is how far the frame sits between the last two ticks; returns the screen areas drawn
+        profiler, rects = self.profiler, []
+        self.camera.interpolate(alpha)
+        if self.renderer:
+            with profiler.phase('bg'):
+                self.renderer.restore(self.screen)
+        else:
+            with profiler.phase('bg'):
+                self._draw_bg()
+            with profiler.phase('world'):
+                self.world.draw(self.screen, self.camera)
+        with profiler.phase('hud'):
+            rects.append(self._draw_hud())
+        with profiler.phase('sprites'):
+            rects.append(self.player.draw(self.screen))
+            for group in self.drawn_groups: rects += self.camera.draw_group(self.screen, group)
+            if self.projectiles: rects += self.projectiles.draw(self.screen, self.camera)
+            if self.particles: rects += self.particles.draw(self.screen, self.camera)
+
+        if self.start_intro:
+            if self.intro_fade.fade(): self.start_intro = False
+            rects.append(self.intro_fade.rect)
+
+        if not self.player.alive:
+            faded = self.death_fade.fade()
+            rects.append(self.death_fade.rect)
+            if faded:
+                rects.append(self.restart_button.rect)
+                if self.restart_button.draw(self.screen): self._reset_level()
+
+        overlay = profiler.draw(self.screen)
+        if overlay: rects.append(overlay)
+        return rects
 
     def update_player_actions(self):
         if self.shoot:
             self.player.shoot()
         elif self.grenade and not self.grenade_thrown and self.player.grenades > 0:
-            self.grenade_group.add(
-                Grenade(self.player.rect.centerx + (0.5 * self.player.rect.size[0] * self.player.direction),
-                        self.player.rect.top, self.player.direction, self))
+            self.grenade_group.add(self.grenade_pool.acquire(
+                self.player.rect.centerx + (0.5 * self.player.rect.size[0] * self.player.direction),
+                self.player.rect.top, self.player.direction))
             self.player.grenades -= 1
             self.grenade_thrown = True
 
@@ -191,18 +412,28 @@ class Game:
         else:
             self.player.update_action(0)
 
-        self.screen_scroll, level_complete = self.player.move(self.moving_left, self.moving_right)
-        self.bg_scroll -= self.screen_scroll
+        with self.profiler.phase('player_move'):
+            level_complete = self.player.move(self.moving_left, self.moving_right)
+
+        if CHECKPOINT_AT and self.checkpoint is None and not self.player.in_air and \
+                self.player.rect.centerx > self.world.level_length * TILE_SIZE * CHECKPOINT_AT:
+            self.checkpoint = LevelSnapshot(self, start=self.level_snapshot)
 
-        for bullet in self.bullet_group:
-            if bullet.owner != self.player and self.player.rect.colliderect(
-                bullet.rect): self.player.health -= bullet.damage; bullet.kill()
-            for enemy in self.enemy_group:
-                if bullet.owner == self.player and enemy.rect.colliderect(
-                    bullet.rect) and enemy.alive: enemy.health -= bullet.damage; bullet.kill(); break
+        with self.profiler.phase('collisions'):
+            if self.projectiles: self.projectiles.resolve_hits(self.player, self.activation.active)
+            for bullet in self.bullet_group:
+                if bullet.owner != self.player:
+                    if self.player.rect.colliderect(bullet.rect): self.player.health -= bullet.damage; bullet.dispose()
+                    continue
+                # Enemies have moved since the layer was rebuilt this tick, hence the slack
+                for enemy in self.collision.nearby('enemies', bullet.rect, slack=TILE_SIZE):
+                    if enemy.rect.colliderect(bullet.rect) and enemy.alive:
+                        enemy.health -= bullet.damage; bullet.dispose(); break
 
         if level_complete:
             self.level += 1
+            # Only the current level can be restored; dropping its snapshot frees the old world
+            self.level_snapshot, self.checkpoint = None, None
             if self.level <= MAX_LEVELS:
                 self._reset_level()
             else:
@@ -218,6 +449,7 @@ class Game:
                 if event.key == pygame.K_q: self.grenade = True
                 if event.key == pygame.K_w and self.player.alive: self.player.jump = True
                 if event.key == pygame.K_ESCAPE: self.running = False
+                if event.key == pygame.K_F3: self.profiler.toggle()
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_a: self.moving_left = False
                 if event.key == pygame.K_d: self.moving_right = False
@@ -226,7 +458,25 @@ class Game:
 
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true', help='run the simulation without a window or audio')
+    parser.add_argument('--ticks', type=int, default=TICK_RATE * 60, help='ticks to simulate in headless mode')
+    parser.add_argument('--seed', type=int, default=None, help='seed for enemy AI randomness')
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--profile', action='store_true', help='show the frame-time overlay (toggle with F3)')
+    parser.add_argument('--profile-csv', metavar='PATH', help='write per-frame phase timings to a CSV file')
+    parser.add_argument('--dirty-rects', action='store_true', help='only push changed screen areas to the display')
+    parser.add_argument('--array-projectiles', action='store_true', default=ARRAY_PROJECTILES,
+                        help='simulate bullets in numpy arrays instead of sprites')
+    args = parser.parse_args()
+
+    game = Game(headless=args.headless, seed=args.seed, profiler=Profiler(args.profile, csv_path=args.profile_csv),
+                dirty_rects=args.dirty_rects, array_projectiles=args.array_projectiles)
+    game.level = args.level
+    if args.headless:
+        print(game.simulate(args.ticks, lambda tick: ('right',)))
+    else:
+        game.run()
+    game.profiler.dump_csv()
     pygame.quit()
     sys.exit()
\ No newline at end of file
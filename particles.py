@@ -0,0 +1,107 @@
+import pygame
+from settings import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# name: (colour, start radius, end radius, lifetime in ticks, gravity, drag, launch speed)
+KINDS = {
+    'smoke': ((90, 90, 90), 4, 12, 45, -0.05, 0.94, 1.5),
+    'spark': ((255, 200, 60), 2, 1, 12, 0.2, 0.88, 6.0),
+    'debris': ((110, 80, 50), 3, 3, 40, 0.6, 0.98, 5.0),
+}
+FRAMES = 8  # pre-rendered fade steps per kind
+
+
+class ParticleSystem:
+    # Cosmetic only: particles live in parallel arrays, never touch the simulation's rng, and are all drawn in one
+    # blits() call. The budget is hard; as it fills up, new bursts are thinned instead of growing the frame time
+    def __init__(self, game, budget=PARTICLE_BUDGET, seed=None):
+        self.game = game
+        self.budget = budget
+        self.rng = np.random.default_rng(seed)
+        self.names = list(KINDS)
+        self.pos = np.zeros((budget, 2), np.float32)
+        self.vel = np.zeros((budget, 2), np.float32)
+        self.age = np.zeros(budget, np.int16)
+        self.kind = np.zeros(budget, np.int8)
+        self.count, self.peak, self.dropped = 0, 0, 0
+
+        kinds = [KINDS[name] for name in self.names]
+        self.life = np.array([kind[3] for kind in kinds], np.int16)
+        self.gravity = np.array([kind[4] for kind in kinds], np.float32)
+        self.drag = np.array([kind[5] for kind in kinds], np.float32)
+        # One flat list of fade frames, indexed by kind * FRAMES + step, with each frame's centring offset
+        self.frames, offsets = [], []
+        for colour, start, end, *_ in kinds:
+            for step in range(FRAMES):
+                t = step / (FRAMES - 1)
+                radius = max(round(start + (end - start) * t), 1)
+                frame = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(frame, (*colour, round(255 * (1 - t * 0.85))), (radius, radius), radius)
+                self.frames.append(frame.convert_alpha())
+                offsets.append(radius)
+        self.offsets = np.array(offsets, np.float32)
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, name, x, y, count, direction=0):
+        # Past half the budget each burst is scaled down by how much room is left, so heavy fights look sparser
+        free = self.budget - self.count
+        wanted = count
+        count = min(count, free, round(count * min(1.0, 2 * free / self.budget)))
+        self.dropped += wanted - count
+        if count <= 0: return
+        kind_id = self.names.index(name)
+        speed = KINDS[name][6]
+        i, j = self.count, self.count + count
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        magnitude = self.rng.uniform(0.3, 1.0, count) * speed
+        self.pos[i:j] = x, y
+        self.vel[i:j, 0] = np.cos(angle) * magnitude + direction * speed
+        self.vel[i:j, 1] = np.sin(angle) * magnitude - (speed * 0.5 if name == 'debris' else 0)
+        self.age[i:j] = 0
+        self.kind[i:j] = kind_id
+        self.count = j
+        self.peak = max(self.peak, j)
+
+    def update(self):
+        n = self.count
+        if not n: return
+        kind = self.kind[:n]
+        vel = self.vel[:n]
+        vel *= self.drag[kind][:, None]
+        vel[:, 1] += self.gravity[kind]
+        self.pos[:n] += vel
+        self.age[:n] += 1
+        keep = self.age[:n] < self.life[kind]
+        if not keep.all():
+            index = np.flatnonzero(keep)
+            m = len(index)
+            for array in (self.pos, self.vel, self.age, self.kind): array[:m] = array[index]
+            self.count = m
+
+    def draw(self, surface, camera):
+        n = self.count
+        if not n: return []
+        kind = self.kind[:n].astype(np.int32)
+        step = np.minimum(self.age[:n] * FRAMES // self.life[kind], FRAMES - 1)
+        frame = kind * FRAMES + step
+        # Velocity stands in for the previous position; particles are cosmetic, so the approximation is fine
+        back = 1 - camera.alpha
+        offset = self.offsets[frame]
+        xs = self.pos[:n, 0] - self.vel[:n, 0] * back - offset - camera.offset
+        ys = self.pos[:n, 1] - self.vel[:n, 1] * back - offset
+        visible = (xs > -2 * offset) & (xs < SCREEN_WIDTH) & (ys > -2 * offset) & (ys < SCREEN_HEIGHT)
+        frames = self.frames
+        return surface.blits([(frames[f], (x, y)) for f, x, y in
+                              zip(frame[visible].tolist(), xs[visible].astype(np.int32).tolist(),
+                                  ys[visible].astype(np.int32).tolist())])
+
+    def stats(self):
+        return {'live': self.count, 'peak': self.peak, 'budget': self.budget, 'dropped': self.dropped}
\ No newline at end of file
@@ -0,0 +1,34 @@
+class SpritePool:
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.in_use = {}
+        self.free = []
+        self.hits, self.misses, self.overflow = 0, 0, 0
+
+    def acquire(self, *args):
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            sprite = self.factory(*args)
+            # Past capacity the sprite is handed out but never taken back, so the pool stays fixed-size
+            if len(self.in_use) < self.capacity:
+                self.misses += 1
+            else:
+                self.overflow += 1
+                return sprite
+        self.in_use[sprite] = True
+        return sprite
+
+    def release(self, sprite):
+        if self.in_use.get(sprite):
+            self.in_use[sprite] = False
+            self.free.append(sprite)
+
+    def reclaim(self):
+        for sprite in self.in_use: self.release(sprite)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'overflow': self.overflow, 'in_use': len(self.in_use) - len(self.free)}
\ No newline at end of file
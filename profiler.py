@@ -0,0 +1,85 @@
+import csv
+import time
+from collections import deque
+from contextlib import nullcontext
+import pygame
+from settings import *
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        timings = self.profiler.timings
+        timings[self.name] = timings.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+
+
+class Profiler:
+    def __init__(self, enabled=False, window=FPS, csv_path=None):
+        self.enabled = enabled or csv_path is not None
+        self.show_overlay = enabled
+        self.csv_path = csv_path
+        self.window = window
+        self.timings, self.counts = {}, {}
+        self.history = {}
+        self.frame_times = deque(maxlen=window)
+        self.intervals = deque(maxlen=window)
+        self.frame_start = None
+        self.rows = []
+        self.frame_count = 0
+        self.font = None
+        self._disabled = nullcontext()
+
+    def toggle(self):
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.csv_path is not None
+
+    def phase(self, name):
+        return _Phase(self, name) if self.enabled else self._disabled
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        # Wall time between frames includes the clock.tick wait, so it gives the real frame rate
+        if self.frame_start is not None: self.intervals.append(now - self.frame_start)
+        self.timings = {}
+        self.frame_start = now
+
+    def end_frame(self, **counts):
+        if not self.enabled: return
+        total = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_count += 1
+        self.frame_times.append(total)
+        for name, ms in self.timings.items():
+            self.history.setdefault(name, deque(maxlen=self.window)).append(ms)
+        self.counts = counts
+        if self.csv_path: self.rows.append({'frame': self.frame_count, 'total_ms': total, **self.timings, **counts})
+
+    def average(self, name):
+        samples = self.history.get(name)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def draw(self, surface):
+        if not self.show_overlay or not self.frame_times: return
+        if self.font is None: self.font = pygame.font.SysFont(FONT_NAME, 16)
+        frame_ms = sum(self.frame_times) / len(self.frame_times)
+        interval = sum(self.intervals) / len(self.intervals) if self.intervals else 0.0
+        lines = [f'FPS {1 / interval if interval else 0:.0f}  frame {frame_ms:.2f} ms']
+        lines += [f'{name}: {self.average(name):.2f} ms' for name in self.history]
+        lines += [' '.join(f'{name} {count}' for name, count in self.counts.items())]
+        panel = pygame.Surface((260, 18 * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, line in enumerate(lines): panel.blit(self.font.render(line, True, WHITE), (6, 4 + 18 * i))
+        return surface.blit(panel, (SCREEN_WIDTH - panel.get_width() - 10, 10))
+
+    def dump_csv(self, path=None):
+        path = path or self.csv_path
+        if not path or not self.rows: return
+        fieldnames = list(dict.fromkeys(key for row in self.rows for key in row))
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, restval=0.0)
+            writer.writeheader()
+            writer.writerows(self.rows)
\ No newline at end of file
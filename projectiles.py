@@ -0,0 +1,118 @@
+from settings import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+class ProjectileArray:
+    # Alternative to Bullet sprites: every live bullet is a row in parallel arrays, kept dense and in firing order
+    def __init__(self, game, capacity=PROJECTILE_CAPACITY):
+        self.game = game
+        self.capacity = capacity
+        self.image = game.bullet_img
+        self.width, self.height = self.image.get_size()
+        self.pos = np.zeros((capacity, 2), np.int32)  # world top-left
+        self.prev_x = np.zeros(capacity, np.int32)  # left edge on the previous tick, for interpolated drawing
+        self.vel = np.zeros(capacity, np.int32)
+        self.damage = np.zeros(capacity)
+        self.owner = np.zeros(capacity, np.int32)
+        self.owners, self.owner_ids = [], {}
+        self.count, self.overflow = 0, 0
+        self.grid_key, self.solid, self.grid_x = None, None, 0
+
+    def clear(self):
+        self.count = 0
+        self.owners, self.owner_ids = [], {}
+
+    def spawn(self, x, y, direction, damage, owner):
+        if self.count >= self.capacity: self.overflow += 1; return
+        if owner not in self.owner_ids:
+            self.owner_ids[owner] = len(self.owners)
+            self.owners.append(owner)
+        i = self.count
+        self.pos[i] = self.image.get_rect(center=(x, y)).topleft  # same rounding as the sprite path
+        self.prev_x[i] = self.pos[i, 0]
+        self.vel[i] = direction * 10
+        self.damage[i] = damage
+        self.owner[i] = self.owner_ids[owner]
+        self.count += 1
+
+    def _solid_grid(self):
+        # Obstacle cells of the streamed-in columns as a (rows, cols) bool array, rebuilt when chunks change
+        world = self.game.world
+        if (world, world.version) != self.grid_key:
+            self.grid_key = world, world.version
+            first, last = world.loaded_columns()
+            self.solid, self.grid_x = np.zeros((world.rows, max(last - first, 1)), bool), first
+            for x, y in world.tile_grid: self.solid[y, x - first] = True
+        return self.solid
+
+    def _compact(self, keep):
+        index = np.flatnonzero(keep)
+        n = len(index)
+        for array in (self.pos, self.prev_x, self.vel, self.damage, self.owner): array[:n] = array[index]
+        self.count = n
+
+    def update(self):
+        n = self.count
+        if not n: return
+        pos = self.pos[:n]
+        self.prev_x[:n] = pos[:, 0]
+        pos[:, 0] += self.vel[:n]
+        left, top = pos[:, 0], pos[:, 1]
+        view = self.game.camera.view
+        keep = (left + self.width >= view.left) & (left <= view.right)
+
+        # Tile hits by index: test the grid cells under the bullet's corners (and every TILE_SIZE between them)
+        solid = self._solid_grid()
+        rows, cols = solid.shape
+        for dx in sorted({*range(0, self.width, TILE_SIZE), self.width - 1}):
+            for dy in sorted({*range(0, self.height, TILE_SIZE), self.height - 1}):
+                cx, cy = (left + dx) // TILE_SIZE - self.grid_x, (top + dy) // TILE_SIZE
+                inside = (cx >= 0) & (cx < cols) & (cy >= 0) & (cy < rows)
+                keep &= ~(inside & solid[np.clip(cy, 0, rows - 1), np.clip(cx, 0, cols - 1)])
+
+        if not keep.all(): self._compact(keep)
+
+    def _overlaps(self, rect, mask):
+        left, top = self.pos[:self.count, 0], self.pos[:self.count, 1]
+        return mask & (left < rect.right) & (left + self.width > rect.left) & \
+            (top < rect.bottom) & (top + self.height > rect.top)
+
+    def resolve_hits(self, player, enemies):
+        # Same rules as the sprite path: enemy bullets hurt the player, player bullets hit the first live enemy
+        n = self.count
+        if not n: return
+        owner = self.owner[:n]
+        keep = np.ones(n, bool)
+        player_id = self.owner_ids.get(player, -1)
+        hit = self._overlaps(player.rect, owner != player_id)
+        if hit.any():
+            player.health -= float(self.damage[:n][hit].sum())
+            keep &= ~hit
+        mine = keep & (owner == player_id)
+        for enemy in enemies:
+            if not mine.any(): break
+            if not enemy.alive: continue
+            hit = self._overlaps(enemy.rect, mine)
+            if hit.any():
+                enemy.health -= float(self.damage[:n][hit].sum())
+                mine &= ~hit
+                keep &= ~hit
+        if not keep.all(): self._compact(keep)
+
+    def draw(self, surface, camera):
+        # One blits() call for every bullet
+        n = self.count
+        if not n: return []
+        x, back = self.pos[:n, 0], 1 - camera.alpha
+        xs = (x + np.rint((self.prev_x[:n] - x) * back).astype(np.int32) - camera.offset).tolist()
+        image = self.image
+        return surface.blits([(image, (x, y)) for x, y in zip(xs, self.pos[:n, 1].tolist())])
+
+    def stats(self):
+        return {'live': self.count, 'capacity': self.capacity, 'overflow': self.overflow}
\ No newline at end of file
@@ -0,0 +1,36 @@
+import pygame
+from settings import *
+
+
+class DirtyRectRenderer:
+    # The background and world layer only change when the camera moves or the level changes, so they are kept
+    # in one static surface; each frame only the areas drawn over last frame are restored from it
+    def __init__(self, game):
+        self.game = game
+        self.static = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.static_key = None
+        self.previous = []
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    def restore(self, surface):
+        game = self.game
+        key = (game.world, game.camera.offset)
+        if key != self.static_key:
+            game.background.draw(self.static, game.camera.offset)
+            game.world.draw(self.static, game.camera)
+            self.static_key, self.full = key, True
+        if self.full:
+            surface.blit(self.static, (0, 0))
+        else:
+            for rect in self.previous: surface.blit(self.static, rect, rect)
+
+    def present(self, rects):
+        # Scrolling (or any other full redraw) falls back to updating the whole window
+        if self.full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous, self.full = rects, False
\ No newline at end of file
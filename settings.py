@@ -2,31 +2,54 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = int(SCREEN_WIDTH * 0.8)
 
 FPS = 60
+TICK_RATE = 60  # simulation steps per second, independent of the rendered frame rate
+MAX_CATCH_UP_TICKS = 5
 GRAVITY = 0.75
 SCROLL_THRESH = 200
+HUD_HEIGHT = 120
+CULL_MARGIN = 80
+ACTIVATION_RADIUS = 400  # pixels beyond the viewport edges; None keeps every enemy awake
 ROWS = 16
-COLS = 150
 TILE_SIZE = SCREEN_HEIGHT // ROWS
 TILE_TYPES = 24
+CHUNK_COLS = 20
+CHUNK_CACHE_SIZE = 12  # baked chunk surfaces kept across loads and restarts
+STREAM_MARGIN = 600  # pixels beyond the viewport kept loaded; keep it above ACTIVATION_RADIUS
+COLLISION_CELL_SIZE = TILE_SIZE * 4
 MAX_LEVELS = 3
+CHECKPOINT_AT = None  # fraction of the level width for an optional mid-level checkpoint, e.g. 0.5
+EXPLOSION_POOL_SIZE = 16
+BULLET_POOL_SIZE = 64
+GRENADE_POOL_SIZE = 8
+ARRAY_PROJECTILES = False  # numpy-backed bullets instead of Bullet sprites; needs numpy
+PROJECTILE_CAPACITY = 1024
+PARTICLES = True  # smoke, sparks and debris; needs numpy and a window
+PARTICLE_BUDGET = 400
+LOADER_BUDGET_MS = 4
+AUDIO_CACHE_DIR = 'audio/.cache'  # decoded PCM of the MP3s, reused on later launches; None disables
+AUDIO_CULL_MARGIN = 300  # sounds from farther than this beyond the screen edges are not played
+AUDIO_STEAL_FADE_MS = 30  # fade applied to the oldest voice of an effect when a new one takes its place
 
 PLAYER_HEALTH = 100
 PLAYER_SPEED = 5
 PLAYER_AMMO = 20
 PLAYER_GRENADES = 5
 PLAYER_DAMAGE = 25
+PLAYER_SCALE = 1.65
 
 ENEMY_HEALTH = 100
 ENEMY_SPEED = 2
 ENEMY_AMMO = 20
 ENEMY_GRENADES = 0
 ENEMY_DAMAGE = 15
+ENEMY_SCALE = 1.65
 
 BOSS_HEALTH = 700
 BOSS_SPEED = 2
 BOSS_AMMO = 1000
 BOSS_GRENADES = 5
 BOSS_DAMAGE = 40
+BOSS_SCALE = 0.6
 
 BG = (144, 201, 120)
 RED = (255, 0, 0)
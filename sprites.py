@@ -1,14 +1,11 @@
 import pygame
-import os
-import random
 from settings import *
-
-
-def load_image_helper(path):
-    return pygame.image.load(path).convert_alpha()
+from assets import animations, effects
 
 
 class Soldier(pygame.sprite.Sprite):
+    ANIMATION_TYPES = ['Idle', 'Run', 'Jump', 'Death']
+
     def __init__(self, game, char_type, x, y, scale, speed, ammo, grenades):
         pygame.sprite.Sprite.__init__(self)
         self.game = game
@@ -30,41 +27,41 @@ class Soldier(pygame.sprite.Sprite):
         self.animation_list = []
         self.frame_index = 0
         self.action = 0
-        self.update_time = pygame.time.get_ticks()
+        self.update_time = self.game.time_ms
 
         self.move_counter = 0
         self.vision = pygame.Rect(0, 0, 150, 20)
         self.idling = False
         self.idling_counter = 0
 
-        animation_types = ['Idle', 'Run', 'Jump', 'Death']
-        for animation in animation_types:
-            temp_list = []
-            try:
-                num_of_frames = len(os.listdir(f'img/{self.char_type}/{animation}'))
-                for i in range(num_of_frames):
-                    img = load_image_helper(f'img/{self.char_type}/{animation}/{i}.png')
-                    img = pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
-                    temp_list.append(img)
-            except FileNotFoundError:
-                print(f"Warning: Animation folder 'img/{self.char_type}/{animation}' not found.")
-            self.animation_list.append(temp_list)
+        for animation in self.ANIMATION_TYPES:
+            self.animation_list.append(animations.get(self.char_type, animation, scale))
 
         self.image = self.animation_list[self.action][self.frame_index] if self.animation_list and self.animation_list[
             self.action] else pygame.Surface((40, 50))
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft
         self.width = self.image.get_width()
         self.height = self.image.get_height()
 
+    def capture(self):
+        # Everything except pygame's private group bookkeeping; rects are copied so later moves don't leak back
+        return {key: value.copy() if isinstance(value, pygame.Rect) else value
+                for key, value in vars(self).items() if not key.startswith('_')}
+
+    def restore(self, state):
+        vars(self).update({key: value.copy() if isinstance(value, pygame.Rect) else value
+                           for key, value in state.items()})
+
     def update(self):
+        self.prev_pos = self.rect.topleft
         self.update_animation()
         self.check_alive()
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
     def move(self, moving_left, moving_right):
-        screen_scroll = 0
         dx, dy = 0, 0
 
         if moving_left: dx = -self.speed; self.flip = True; self.direction = -1
@@ -74,13 +71,14 @@ class Soldier(pygame.sprite.Sprite):
             self.vel_y = -15
             self.jump = False
             self.in_air = True
-            self.game.jump_fx.play()
+            self.game.audio.play('jump', self.rect)
 
         self.vel_y += GRAVITY
         if self.vel_y > 10: self.vel_y = 10
         dy += self.vel_y
 
-        for tile in self.game.world.obstacle_list:
+        area = self.rect.move(dx, 0).union(self.rect.move(0, dy))
+        for tile in self.game.world.tiles_in_rect(area):
             if tile[1].colliderect(self.rect.x + dx, self.rect.y, self.width, self.height):
                 dx = 0
                 if self.char_type in ['enemy', 'boss']: self.direction *= -1; self.move_counter = 0
@@ -96,33 +94,31 @@ class Soldier(pygame.sprite.Sprite):
         if pygame.sprite.spritecollide(self, self.game.exit_group, False): level_complete = True
 
         if self.rect.bottom > SCREEN_HEIGHT: self.health = 0
-        if self.char_type == 'player' and (self.rect.left + dx < 0 or self.rect.right + dx > SCREEN_WIDTH): dx = 0
+        if self.char_type == 'player':
+            screen_rect = self.game.camera.apply(self.rect)
+            if screen_rect.left + dx < 0 or screen_rect.right + dx > SCREEN_WIDTH: dx = 0
 
         self.rect.x += dx
         self.rect.y += dy
 
         if self.char_type == 'player':
-            if (self.rect.right > SCREEN_WIDTH - SCROLL_THRESH and self.game.bg_scroll < (
-                    self.game.world.level_length * TILE_SIZE) - SCREEN_WIDTH) or \
-                    (self.rect.left < SCROLL_THRESH and self.game.bg_scroll > abs(dx)):
-                self.rect.x -= dx
-                screen_scroll = -dx
+            self.game.camera.follow(self.rect, dx, self.game.world.level_length * TILE_SIZE)
 
-        return screen_scroll, level_complete
+        return level_complete
 
     def shoot(self):
         if self.shoot_cooldown == 0 and self.ammo > 0:
             self.shoot_cooldown = 20
             damage = PLAYER_DAMAGE * self.damage_multiplier if self.char_type == 'player' else ENEMY_DAMAGE
-            bullet = Bullet(self.rect.centerx + (0.75 * self.rect.size[0] * self.direction), self.rect.centery,
-                            self.direction, damage, self, self.game)
-            self.game.bullet_group.add(bullet)
+            muzzle_x = self.rect.centerx + (0.75 * self.rect.size[0] * self.direction)
+            self.game.fire_bullet(muzzle_x, self.rect.centery, self.direction, damage, self)
+            self.game.emit('spark', muzzle_x, self.rect.centery, 4, self.direction)
             self.ammo -= 1
-            self.game.shot_fx.play()
+            self.game.audio.play('shot', self.rect)
 
     def ai(self):
         if self.alive and self.game.player.alive:
-            if not self.idling and random.randint(1, 200) == 1:
+            if not self.idling and self.game.rng.randint(1, 200) == 1:
                 self.update_action(0)
                 self.idling = True
                 self.idling_counter = 50
@@ -142,14 +138,12 @@ class Soldier(pygame.sprite.Sprite):
                     self.idling_counter -= 1
                     if self.idling_counter <= 0: self.idling = False
 
-        self.rect.x += self.game.screen_scroll
-
     def update_animation(self):
         ANIMATION_COOLDOWN = 100
         if not self.animation_list or not self.animation_list[self.action]: return
         self.image = self.animation_list[self.action][self.frame_index]
-        if pygame.time.get_ticks() - self.update_time > ANIMATION_COOLDOWN:
-            self.update_time = pygame.time.get_ticks()
+        if self.game.time_ms - self.update_time > ANIMATION_COOLDOWN:
+            self.update_time = self.game.time_ms
             self.frame_index += 1
         if self.frame_index >= len(self.animation_list[self.action]):
             if self.action == 3:
@@ -161,7 +155,7 @@ class Soldier(pygame.sprite.Sprite):
         if new_action != self.action:
             self.action = new_action
             self.frame_index = 0
-            self.update_time = pygame.time.get_ticks()
+            self.update_time = self.game.time_ms
 
     def check_alive(self):
         if self.health <= 0:
@@ -171,7 +165,8 @@ class Soldier(pygame.sprite.Sprite):
             self.update_action(3)
 
     def draw(self, surface):
-        surface.blit(pygame.transform.flip(self.image, self.flip, False), self.rect)
+        image = animations.mirrored(self.image) if self.flip else self.image
+        return surface.blit(image, self.game.camera.project(self))
 
 
 class Boss(Soldier):
@@ -188,20 +183,20 @@ class Boss(Soldier):
 
             bullet_y_position = self.rect.centery + 40  # Высота выстрела
 
-            bullet = Bullet(
-                self.rect.centerx + (0.75 * self.rect.size[0] * self.direction),
+            muzzle_x = self.rect.centerx + (0.75 * self.rect.size[0] * self.direction)
+            self.game.fire_bullet(
+                muzzle_x,
                 bullet_y_position,
                 self.direction,
                 damage,
-                self,
-                self.game
+                self
             )
-            self.game.bullet_group.add(bullet)
+            self.game.emit('spark', muzzle_x, bullet_y_position, 4, self.direction)
 
             if self.char_type == 'player':
                 self.ammo -= 1
 
-            self.game.shot_fx.play()
+            self.game.audio.play('shot', self.rect)
 
     def ai(self):
         if self.alive and self.game.player.alive:
@@ -224,8 +219,6 @@ class Boss(Soldier):
                 self.move(moving_left, moving_right)
                 self.update_action(1)
 
-        self.rect.x += self.game.screen_scroll
-
 
 class ItemBox(pygame.sprite.Sprite):
     def __init__(self, game, item_type, x, y):
@@ -236,58 +229,74 @@ class ItemBox(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.midtop = (x + TILE_SIZE // 2, y + (TILE_SIZE - self.image.get_height()))
 
-    def update(self):
-        self.rect.x += self.game.screen_scroll
-        if pygame.sprite.collide_rect(self, self.game.player):
-            self.game.powerup_fx.play()
-            if self.item_type == 'Health':
-                self.game.player.health = min(self.game.player.health + 25, self.game.player.max_health)
-            elif self.item_type == 'Ammo':
-                self.game.player.ammo += 15
-            elif self.item_type == 'Grenade':
-                self.game.player.grenades += 3
-            elif self.item_type == 'Damage':
-                self.game.player.damage_multiplier += 0.5
-            self.kill()
+    def collect(self, player):
+        self.game.audio.play('powerup')
+        if self.item_type == 'Health':
+            player.health = min(player.health + 25, player.max_health)
+        elif self.item_type == 'Ammo':
+            player.ammo += 15
+        elif self.item_type == 'Grenade':
+            player.grenades += 3
+        elif self.item_type == 'Damage':
+            player.damage_multiplier += 0.5
+        self.kill()
 
 
 class Bullet(pygame.sprite.Sprite):
+    # Bullets are recycled through game.bullet_pool; reset() is the only place their state is set
     def __init__(self, x, y, direction, damage, owner, game):
         pygame.sprite.Sprite.__init__(self)
         self.game = game
         self.speed = 10
         self.image = self.game.bullet_img
         self.rect = self.image.get_rect()
+        self.reset(x, y, direction, damage, owner)
+
+    def reset(self, x, y, direction, damage, owner):
         self.rect.center = (x, y)
+        self.prev_pos = self.rect.topleft
         self.direction = direction
         self.damage = damage
         self.owner = owner
 
+    def dispose(self):
+        self.kill()
+        self.owner = None
+        self.game.bullet_pool.release(self)
+
     def update(self):
-        self.rect.x += (self.direction * self.speed) + self.game.screen_scroll
-        if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH: self.kill()
+        self.prev_pos = self.rect.topleft
+        self.rect.x += self.direction * self.speed
+        view = self.game.camera.view
+        if self.rect.right < view.left or self.rect.left > view.right: self.dispose(); return
 
-        for tile in self.game.world.obstacle_list:
-            if tile[1].colliderect(self.rect): self.kill(); break
+        for tile in self.game.world.tiles_in_rect(self.rect):
+            if tile[1].colliderect(self.rect): self.dispose(); break
 
 
 class Grenade(pygame.sprite.Sprite):
     def __init__(self, x, y, direction, game):
         pygame.sprite.Sprite.__init__(self)
         self.game = game
+        self.image = self.game.grenade_img_icon
+        self.rect = self.image.get_rect()
+        self.width, self.height = self.image.get_width(), self.image.get_height()
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction):
         self.timer = 100
         self.vel_y = -11
         self.speed = 7
-        self.image = self.game.grenade_img_icon
-        self.rect = self.image.get_rect()
         self.rect.center = (x, y)
-        self.width, self.height = self.image.get_width(), self.image.get_height()
+        self.prev_pos = self.rect.topleft
         self.direction = direction
 
     def update(self):
+        self.prev_pos = self.rect.topleft
         self.vel_y += GRAVITY
         dx, dy = self.direction * self.speed, self.vel_y
-        for tile in self.game.world.obstacle_list:
+        area = self.rect.move(-abs(dx), 0).union(self.rect.move(abs(dx), dy))
+        for tile in self.game.world.tiles_in_rect(area):
             if tile[1].colliderect(self.rect.x + dx, self.rect.y, self.width,
                                    self.height): self.direction *= -1; dx = self.direction * self.speed
             if tile[1].colliderect(self.rect.x, self.rect.y + dy, self.width, self.height):
@@ -297,29 +306,31 @@ class Grenade(pygame.sprite.Sprite):
                 elif self.vel_y >= 0:
                     self.vel_y = 0; dy = tile[1].top - self.rect.bottom
 
-        self.rect.x += dx + self.game.screen_scroll
+        self.rect.x += dx
         self.rect.y += dy
 
         self.timer -= 1
         if self.timer <= 0:
-            self.kill();
-            self.game.grenade_fx.play()
-            explosion = Explosion(self.rect.x, self.rect.y, 0.5, self.game)
-            self.game.explosion_group.add(explosion)
+            self.kill()
+            self.game.grenade_pool.release(self)
+            self.game.audio.play('grenade', self.rect)
+            self.game.explosion_group.add(self.game.explosion_pool.acquire(self.rect.x, self.rect.y))
+            for name, count in (('smoke', 14), ('spark', 18), ('debris', 10)):
+                self.game.emit(name, self.rect.centerx, self.rect.centery, count)
             if abs(self.rect.centerx - self.game.player.rect.centerx) < TILE_SIZE * 2: self.game.player.health -= 50
-            for enemy in self.game.enemy_group:
+            blast = pygame.Rect(self.rect.centerx - TILE_SIZE * 2, 0, TILE_SIZE * 4, SCREEN_HEIGHT)
+            for enemy in self.game.collision.nearby('enemies', blast, slack=TILE_SIZE):
                 if abs(self.rect.centerx - enemy.rect.centerx) < TILE_SIZE * 2: enemy.health -= 50
 
 
 class Explosion(pygame.sprite.Sprite):
-    def __init__(self, x, y, scale, game):
+    def __init__(self, x, y, game):
         pygame.sprite.Sprite.__init__(self)
         self.game = game
-        self.images = []
-        for num in range(1, 6):
-            img = load_image_helper(f'img/explosion/exp{num}.png')
-            img = pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
-            self.images.append(img)
+        self.images = effects['explosion']
+        self.reset(x, y)
+
+    def reset(self, x, y):
         self.frame_index = 0
         self.image = self.images[self.frame_index]
         self.rect = self.image.get_rect()
@@ -327,7 +338,6 @@ class Explosion(pygame.sprite.Sprite):
         self.counter = 0
 
     def update(self):
-        self.rect.x += self.game.screen_scroll
         EXPLOSION_SPEED = 4
         self.counter += 1
         if self.counter >= EXPLOSION_SPEED:
@@ -335,6 +345,7 @@ class Explosion(pygame.sprite.Sprite):
             self.frame_index += 1
             if self.frame_index >= len(self.images):
                 self.kill()
+                self.game.explosion_pool.release(self)
             else:
                 self.image = self.images[self.frame_index]
 
@@ -349,16 +360,20 @@ class ScreenFade:
 
     def reset(self):
         self.fade_counter = SCREEN_HEIGHT if self.fade_in else 0
+        self.rect = pygame.Rect(0, 0, SCREEN_WIDTH, self.fade_counter)
 
     def fade(self):
         fade_complete = False
         if self.fade_in:
             self.fade_counter -= self.speed
+            # A shrinking fade still has to repaint the strip it just uncovered
+            self.rect = pygame.Rect(0, 0, SCREEN_WIDTH, self.fade_counter + self.speed)
             pygame.draw.rect(self.screen, self.colour, (0, 0, SCREEN_WIDTH, self.fade_counter))
             if self.fade_counter <= 0:
                 fade_complete = True
         else:
             self.fade_counter += self.speed
+            self.rect = pygame.Rect(0, 0, SCREEN_WIDTH, self.fade_counter)
             pygame.draw.rect(self.screen, self.colour, (0, 0, SCREEN_WIDTH, self.fade_counter))
             if self.fade_counter >= SCREEN_HEIGHT:
                 fade_complete = True
@@ -2,60 +2,167 @@ import pygame
 from settings import *
 from sprites import Soldier, Boss, ItemBox
 
+# Soldier tiles and the animation set each one needs, so a level's frames can be prefetched before it starts
+CHARACTER_TILES = {15: ('player', PLAYER_SCALE), 16: ('enemy', ENEMY_SCALE), 21: ('boss', BOSS_SCALE)}
+ITEM_TILES = {17: 'Ammo', 18: 'Grenade', 19: 'Health', 23: 'Damage'}
+# Pre-rendered static layer, keyed by (level, chunk index) and kept in least-recently-used order
+_chunk_cache = {}
+
+
+def _gone(sprite):
+    # Collected item boxes have been killed out of their group; dead soldiers only flip their alive flag
+    return sprite.alive is False or not sprite.groups()
+
 
 class World:
+    # Levels are streamed in column chunks of CHUNK_COLS around the camera; sprites of evicted chunks are dropped,
+    # and the spawn tiles of collected items and killed enemies are remembered in removed so they never come back
     def __init__(self, game):
         self.game = game
-        self.obstacle_list = []
+        self.data = None
+        self.rows = ROWS
+        self.tile_grid = {}
+        self.chunks = {}
+        self.loaded = {}
+        self.removed = set()
+        self.version = 0
         self.level_length = 0
 
     def process_data(self, data):
-        self.level_length = len(data[0])
-        player, health_bar = None, None
-
-        for y, row in enumerate(data):
-            for x, tile in enumerate(row):
-                if tile >= 0:
-                    img = self.game.img_list[tile]
+        self.data, self.rows, self.level_length = data, data.rows, data.cols
+        # Only the player is created up front; everything else arrives with its chunk
+        index = data.tiles.tobytes().find(bytes([15]))
+        if index < 0: return None, None
+        x, y = divmod(index, data.rows)
+        self.removed.add((x, y))
+        player = Soldier(self.game, 'player', x * TILE_SIZE, y * TILE_SIZE, PLAYER_SCALE, PLAYER_SPEED,
+                         PLAYER_AMMO, PLAYER_GRENADES)
+        return player, HealthBar(10, 10, player.health, player.health)
+
+    @property
+    def chunk_count(self):
+        return (self.level_length + CHUNK_COLS - 1) // CHUNK_COLS
+
+    def stream(self, camera):
+        chunk_width = CHUNK_COLS * TILE_SIZE
+        view = camera.view
+        first = max((view.left - STREAM_MARGIN) // chunk_width, 0)
+        last = min((view.right + STREAM_MARGIN) // chunk_width, self.chunk_count - 1)
+        # One chunk of hysteresis, so walking back and forth over a boundary doesn't reload it every time
+        stale = [index for index in self.loaded if index < first - 1 or index > last + 1]
+        fresh = [index for index in range(first, last + 1) if index not in self.loaded]
+        if not stale and not fresh: return
+        for index in stale: self._evict(index)
+        for index in fresh: self._load(index)
+        self.version += 1
+        self.game.collision.rebuild('items', self.game.item_box_group)
+
+    def unload(self):
+        for index in list(self.loaded): self._evict(index)
+
+    def persistent_state(self):
+        return self.removed | {sprite.spawn_tile for sprites in self.loaded.values() for sprite in sprites
+                               if _gone(sprite)}
+
+    def loaded_columns(self):
+        if not self.loaded: return 0, 0
+        return min(self.loaded) * CHUNK_COLS, min((max(self.loaded) + 1) * CHUNK_COLS, self.level_length)
+
+    def _load(self, index):
+        spawned, static = [], []
+        for x in range(index * CHUNK_COLS, min((index + 1) * CHUNK_COLS, self.level_length)):
+            for y, tile in enumerate(self.data.column(x)):
+                if tile < 0 or (x, y) in self.removed: continue
+                img = self.game.img_list[tile]
+                if 0 <= tile <= 8:
                     img_rect = img.get_rect()
                     img_rect.x, img_rect.y = x * TILE_SIZE, y * TILE_SIZE
-                    tile_data = (img, img_rect)
-
-                    if 0 <= tile <= 8:
-                        self.obstacle_list.append(tile_data)
-                    elif 9 <= tile <= 10:
-                        self.game.water_group.add(Water(img, x * TILE_SIZE, y * TILE_SIZE, self.game))
-                    elif 11 <= tile <= 14:
-                        self.game.decoration_group.add(Decoration(img, x * TILE_SIZE, y * TILE_SIZE, self.game))
-                    elif tile == 15:
-                        player = Soldier(self.game, 'player', x * TILE_SIZE, y * TILE_SIZE, 1.65, PLAYER_SPEED,
-                                         PLAYER_AMMO, PLAYER_GRENADES)
-                        health_bar = HealthBar(10, 10, player.health, player.health)
-                    elif tile == 16:
-                        self.game.enemy_group.add(
-                            Soldier(self.game, 'enemy', x * TILE_SIZE, y * TILE_SIZE, 1.65, ENEMY_SPEED, ENEMY_AMMO,
-                                    ENEMY_GRENADES))
-                    elif tile == 17:
-                        self.game.item_box_group.add(ItemBox(self.game, 'Ammo', x * TILE_SIZE, y * TILE_SIZE))
-                    elif tile == 18:
-                        self.game.item_box_group.add(ItemBox(self.game, 'Grenade', x * TILE_SIZE, y * TILE_SIZE))
-                    elif tile == 19:
-                        self.game.item_box_group.add(ItemBox(self.game, 'Health', x * TILE_SIZE, y * TILE_SIZE))
-                    elif tile == 20:
-                        self.game.exit_group.add(Exit(img, x * TILE_SIZE, y * TILE_SIZE, self.game))
-                    elif tile == 21:
-                        self.game.enemy_group.add(
-                            Boss(self.game, 'boss', x * TILE_SIZE, y * TILE_SIZE, 0.6, BOSS_SPEED, BOSS_AMMO,
-                                 BOSS_GRENADES))
-                    elif tile == 23:
-                        self.game.item_box_group.add(ItemBox(self.game, 'Damage', x * TILE_SIZE, y * TILE_SIZE))
-
-        return player, health_bar
-
-    def draw(self, surface, screen_scroll):
-        for tile in self.obstacle_list:
-            tile[1][0] += screen_scroll
-            surface.blit(tile[0], tile[1])
+                    self.tile_grid[(x, y)] = (img, img_rect)
+                    static.append((img, img_rect))
+                    continue
+                sprite = self._spawn(tile, img, x * TILE_SIZE, y * TILE_SIZE)
+                if sprite is None: continue
+                sprite.spawn_tile = (x, y)
+                spawned.append(sprite)
+                if 9 <= tile <= 14: static.append((sprite.image, sprite.rect))
+        self.loaded[index] = spawned
+        self.chunks[index] = self._bake_chunk(index, static)
+
+    def _spawn(self, tile, img, x, y):
+        game = self.game
+        if 9 <= tile <= 10:
+            sprite, group = Water(img, x, y, game), game.water_group
+        elif 11 <= tile <= 14:
+            sprite, group = Decoration(img, x, y, game), game.decoration_group
+        elif tile == 16:
+            sprite, group = Soldier(game, 'enemy', x, y, ENEMY_SCALE, ENEMY_SPEED, ENEMY_AMMO,
+                                    ENEMY_GRENADES), game.enemy_group
+        elif tile in ITEM_TILES:
+            sprite, group = ItemBox(game, ITEM_TILES[tile], x, y), game.item_box_group
+        elif tile == 20:
+            sprite, group = Exit(img, x, y, game), game.exit_group
+        elif tile == 21:
+            sprite, group = Boss(game, 'boss', x, y, BOSS_SCALE, BOSS_SPEED, BOSS_AMMO, BOSS_GRENADES), game.enemy_group
+        else:
+            return None
+        group.add(sprite)
+        return sprite
+
+    def _evict(self, index):
+        for sprite in self.loaded.pop(index):
+            if _gone(sprite): self.removed.add(sprite.spawn_tile)
+            sprite.kill()
+        for x in range(index * CHUNK_COLS, (index + 1) * CHUNK_COLS):
+            for y in range(self.rows): self.tile_grid.pop((x, y), None)
+        del self.chunks[index]
+
+    def _bake_chunk(self, index, static):
+        key = (self.game.level, index)
+        chunk = _chunk_cache.pop(key, None)
+        if chunk is None:
+            chunk_width = CHUNK_COLS * TILE_SIZE
+            chunk = pygame.Surface((chunk_width, self.rows * TILE_SIZE), pygame.SRCALPHA)
+            chunk_x = index * chunk_width
+            chunk.blits([(img, rect.move(-chunk_x, 0)) for img, rect in static], doreturn=False)
+        _chunk_cache[key] = chunk
+        while len(_chunk_cache) > CHUNK_CACHE_SIZE: del _chunk_cache[next(iter(_chunk_cache))]
+        return chunk
+
+    def tiles_in_rect(self, rect):
+        # Uniform grid lookup: only the cells under rect, in row-major order
+        left, right = rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE
+        top, bottom = rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE
+        grid = self.tile_grid
+        return [grid[(x, y)] for y in range(top, bottom + 1) for x in range(left, right + 1) if (x, y) in grid]
+
+    def draw(self, surface, camera):
+        first, last = camera.visible_columns()
+        chunks = self.chunks
+        for index in range(first // CHUNK_COLS, (last - 1) // CHUNK_COLS + 1):
+            if index in chunks: surface.blit(chunks[index], (index * CHUNK_COLS * TILE_SIZE - camera.offset, 0))
+
+
+class LevelSnapshot:
+    # The player is put back to its captured state and the world re-streams around the saved scroll;
+    # items collected and enemies killed before the snapshot stay gone. A checkpoint passes the level-start snapshot
+    # as start, so a player who reached it weakened respawns with at least the supplies the level began with
+    def __init__(self, game, start=None):
+        self.world, self.player, self.health_bar = game.world, game.player, game.health_bar
+        self.scroll = game.camera.scroll
+        self.state = game.player.capture()
+        if start:
+            for key in ('health', 'ammo', 'grenades'): self.state[key] = max(self.state[key], start.state[key])
+        self.removed = game.world.persistent_state()
+
+    def restore(self, game):
+        self.world.unload()
+        for group in game.all_groups: group.empty()
+        game._create_sprite_groups()
+        self.player.restore(self.state)
+        game.world, game.player, game.health_bar = self.world, self.player, self.health_bar
+        game.camera.reset(self.scroll)
+        self.world.removed = set(self.removed)
+        self.world.stream(game.camera)
 
 
 class HealthBar:
@@ -78,9 +185,6 @@ class WorldElement(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.midtop = (x + TILE_SIZE // 2, y + (TILE_SIZE - self.image.get_height()))
 
-    def update(self):
-        self.rect.x += self.game.screen_scroll
-
 
 class Decoration(WorldElement): pass
 